@@ -12,7 +12,7 @@
 import numpy as np
 import sys, os
 import datetime
-from scipy import interpolate, gradient, integrate
+from scipy import interpolate, integrate
 from ROSCO_toolbox.utilities import list_check
 
 # Some useful constants
@@ -23,6 +23,9 @@ deg2rad = np.deg2rad(1)
 rpm2RadSec = 2.0*(np.pi)/60.0
 RadSec2rpm = 60/(2.0 * np.pi)
 
+# Steady state operating point data, stored together by Controller.tune_controller
+OP_DTYPE = np.dtype([('v', 'f8'), ('TSR_op', 'f8'), ('Cp_op', 'f8'), ('pitch_op', 'f8')])
+
 class Controller():
     """
     Class Controller used to calculate controller tunings parameters
@@ -162,6 +165,23 @@ class Controller():
                 'U_pc, omega_pc, and zeta_pc are all list-like and are not of equal length')
         
 
+    # Operating point data are read-only views into the op_points structured array
+    @property
+    def v(self):
+        return self.op_points['v']
+
+    @property
+    def TSR_op(self):
+        return self.op_points['TSR_op']
+
+    @property
+    def Cp_op(self):
+        return self.op_points['Cp_op']
+
+    @property
+    def pitch_op(self):
+        return self.op_points['pitch_op']
+
     def tune_controller(self, turbine):
         """
         Given a turbine model, tune a controller based on the NREL generic controller tuning process
@@ -176,88 +196,93 @@ class Controller():
         J = turbine.J                           # Total rotor inertial (kg-m^2) 
         rho = turbine.rho                       # Air density (kg/m^3)
         R = turbine.rotor_radius                    # Rotor radius (m)
-        Ar = np.pi*R**2                         # Rotor area (m^2)
         Ng = turbine.Ng                         # Gearbox ratio (-)
         rated_rotor_speed = turbine.rated_rotor_speed               # Rated rotor speed (rad/s)
+        pitch_initial_rad = turbine.pitch_initial_rad               # Rotor performance table pitch angles (rad)
+        TSR_initial = turbine.TSR_initial                           # Rotor performance table tip-speed ratios (-)
+        pitch_del = pitch_initial_rad[1] - pitch_initial_rad[0]     # rotor performance grid spacing, assumed uniform
+        TSR_del = TSR_initial[1] - TSR_initial[0]
 
 
         # -------------Define Operation Points ------------- #
         TSR_rated = rated_rotor_speed*R/turbine.v_rated  # TSR at rated
 
+        # Operation points are filled in place, below rated followed by above rated
+        n_br = self.WS_GS_n - self.PC_GS_n - 1  # number of below rated points
+        op_points = np.empty(self.WS_GS_n, dtype=OP_DTYPE)
+        v       = op_points['v']                # Wind speeds
+        TSR_op  = op_points['TSR_op']           # operational TSRs
+        Cp_op   = op_points['Cp_op']            # operational CPs to linearize around
+        pitch_op = op_points['pitch_op']        # operational blade pitch angles
+
         # separate wind speeds by operation regions
         # add one to above rated because we don't use rated in the pitch control gain scheduling
-        v_below_rated = np.linspace(turbine.v_min,turbine.v_rated, num=self.WS_GS_n-self.PC_GS_n)[:-1]             # below rated
-        v_above_rated = np.linspace(turbine.v_rated,turbine.v_max, num=self.PC_GS_n+1)             # above rated
-        v = np.concatenate((v_below_rated, v_above_rated))
+        v[:n_br] = np.linspace(turbine.v_min,turbine.v_rated, num=self.WS_GS_n-self.PC_GS_n)[:-1]             # below rated
+        v[n_br:] = np.linspace(turbine.v_rated,turbine.v_max, num=self.PC_GS_n+1)             # above rated
+        v_below_rated = v[:n_br]
+        v_above_rated = v[n_br:]
 
         # separate TSRs by operations regions
-        TSR_below_rated = [min(turbine.TSR_operational, rated_rotor_speed*R/v) for v in v_below_rated] # below rated     
-        TSR_above_rated = rated_rotor_speed*R/v_above_rated                   # above rated
-        # TSR_below_rated = np.minimum(np.max(TSR_above_rated), TSR_below_rated)
-        TSR_op = np.concatenate((TSR_below_rated, TSR_above_rated))   # operational TSRs
+        TSR_op[:n_br] = np.minimum(turbine.TSR_operational, rated_rotor_speed*R/v_below_rated) # below rated     
+        TSR_op[n_br:] = rated_rotor_speed*R/v_above_rated                   # above rated
+        TSR_above_rated = TSR_op[n_br:]
 
         # Find expected operational Cp values
         Cp_above_rated = turbine.Cp.interp_surface(0,TSR_above_rated[0])             # Cp during rated operation (not optimal). Assumes cut-in bld pitch to be 0
-        Cp_op_br = np.ones(len(v_below_rated)) * turbine.Cp.max              # below rated
-        Cp_op_ar = Cp_above_rated * (TSR_above_rated/TSR_rated)**3           # above rated
-        Cp_op = np.concatenate((Cp_op_br, Cp_op_ar))                # operational CPs to linearize around
-        pitch_initial_rad = turbine.pitch_initial_rad
-        TSR_initial = turbine.TSR_initial
-
-        # initialize variables
-        pitch_op    = np.empty(len(TSR_op))
-        dCp_beta    = np.empty(len(TSR_op))
-        dCp_TSR     = np.empty(len(TSR_op))
-        dCt_beta    = np.empty(len(TSR_op))
-        dCt_TSR     = np.empty(len(TSR_op))
-        Ct_op       = np.empty(len(TSR_op))
+        Cp_op[:n_br] = turbine.Cp.max                                        # below rated
+        Cp_op[n_br:] = Cp_above_rated * (TSR_above_rated/TSR_rated)**3       # above rated
 
         # ------------- Find Linearized State "Matrices" ------------- #
-        for i in range(len(TSR_op)):
-            # Find pitch angle as a function of expected operating CP for each TSR
-            Cp_TSR = np.ndarray.flatten(turbine.Cp.interp_surface(turbine.pitch_initial_rad, TSR_op[i]))     # all Cp values for a given tsr
-            Cp_maxidx = Cp_TSR.argmax()    
-            Cp_op[i] = np.clip(Cp_op[i], np.min(Cp_TSR[Cp_maxidx:]), np.max(Cp_TSR[Cp_maxidx:])) # saturate Cp values to be on Cp surface                                                             # Find maximum Cp value for this TSR
-            f_cp_pitch = interpolate.interp1d(Cp_TSR[Cp_maxidx:],pitch_initial_rad[Cp_maxidx:])         # interpolate function for Cp(tsr) values
-            # expected operation blade pitch values
-            if v[i] <= turbine.v_rated and isinstance(self.min_pitch, float): # Below rated & defined min_pitch
-                pitch_op[i] = min(self.min_pitch, f_cp_pitch(Cp_op[i]))
-            elif isinstance(self.min_pitch, float):
-                pitch_op[i] = max(self.min_pitch, f_cp_pitch(Cp_op[i]))             
-            else:
-                pitch_op[i] = f_cp_pitch(Cp_op[i])     
-
-            dCp_beta[i], dCp_TSR[i] = turbine.Cp.interp_gradient(pitch_op[i],TSR_op[i])       # gradients of Cp surface in Beta and TSR directions
-            dCt_beta[i], dCt_TSR[i] = turbine.Ct.interp_gradient(pitch_op[i],TSR_op[i])       # gradients of Cp surface in Beta and TSR directions
-        
-            # Thrust
-            Ct_TSR      = np.ndarray.flatten(turbine.Ct.interp_surface(turbine.pitch_initial_rad, TSR_op[i]))     # all Cp values for a given tsr
-            f_ct        = interpolate.interp1d(pitch_initial_rad,Ct_TSR)
-            Ct_op[i]    = f_ct(pitch_op[i])
-            Ct_op[i]    = np.clip(Ct_op[i], np.min(Ct_TSR), np.max(Ct_TSR))        # saturate Ct values to be on Ct surface
-
+        # Cp values along pitch for every operational TSR, rows ordered as TSR_op (interp_surface sorts its inputs)
+        TSR_sort = np.argsort(TSR_op)
+        Cp_TSR = np.empty((len(TSR_op), len(pitch_initial_rad)))
+        Cp_TSR[TSR_sort] = turbine.Cp.interp_surface(pitch_initial_rad, TSR_op)
+
+        # Only use the portion of each Cp curve past its maximizing pitch angle
+        Cp_maxidx = Cp_TSR.argmax(axis=1)
+        Cp_branch = np.arange(len(pitch_initial_rad)) >= Cp_maxidx[:, np.newaxis]
+        np.clip(Cp_op,
+                np.min(Cp_TSR, axis=1, initial=np.inf, where=Cp_branch),
+                np.max(Cp_TSR, axis=1, initial=-np.inf, where=Cp_branch), out=Cp_op)  # saturate Cp values to be on Cp surface
+
+        # expected operation blade pitch values
+        # operating points saturated at the top of their Cp curve (e.g., below rated) sit at the Cp-maximizing pitch,
+        # only the remaining points need to be inverted
+        Cp_sat = Cp_op >= Cp_TSR.max(axis=1)
+        pitch_op[:] = pitch_initial_rad[Cp_maxidx]
+        pitch_op[~Cp_sat] = interp_rows(Cp_op[~Cp_sat], Cp_TSR[~Cp_sat], pitch_initial_rad, where=Cp_branch[~Cp_sat])
+        if isinstance(self.min_pitch, float):
+            pitch_op[:] = np.where(v <= turbine.v_rated,
+                                   np.minimum(self.min_pitch, pitch_op),   # Below rated & defined min_pitch
+                                   np.maximum(self.min_pitch, pitch_op))
+
+        # Ct values along pitch for every operational TSR, rows ordered as TSR_op
+        Ct_TSR = np.empty((len(TSR_op), len(pitch_initial_rad)))
+        Ct_TSR[TSR_sort] = turbine.Ct.interp_surface(pitch_initial_rad, TSR_op)
+
+        # Thrust, operational pitch angles must lie within the rotor performance table
+        if np.any(pitch_op < np.min(pitch_initial_rad)) or np.any(pitch_op > np.max(pitch_initial_rad)):
+            raise ValueError('ROSCO_toolbox:controller: operational pitch angles are outside of the rotor performance table')
+        Ct_op = interp_rows(pitch_op, np.broadcast_to(pitch_initial_rad, Ct_TSR.shape), Ct_TSR)
+        Ct_op = np.clip(Ct_op, Ct_TSR.min(axis=1), Ct_TSR.max(axis=1))        # saturate Ct values to be on Ct surface
+
+        # gradients of Cp and Ct surfaces in Beta and TSR directions at all operating points
+        dCp_beta, dCp_TSR = turbine.Cp.interp_gradient(pitch_op, TSR_op)
+        dCt_beta, dCt_TSR = turbine.Ct.interp_gradient(pitch_op, TSR_op)
 
         # Define minimum pitch saturation to be at Cp-maximizing pitch angle if not specifically defined
         if not isinstance(self.min_pitch, float):
             self.min_pitch = pitch_op[0]
 
         # Full Cx surface gradients
-        dCp_dbeta   = dCp_beta/np.diff(pitch_initial_rad)[0]
-        dCp_dTSR    = dCp_TSR/np.diff(TSR_initial)[0]
-        dCt_dbeta   = dCt_beta/np.diff(pitch_initial_rad)[0]
-        dCt_dTSR    = dCt_TSR/np.diff(TSR_initial)[0]
+        dCp_dbeta   = dCp_beta/pitch_del
+        dCp_dTSR    = dCp_TSR/TSR_del
+        dCt_dbeta   = dCt_beta/pitch_del
+        dCt_dTSR    = dCt_TSR/TSR_del
         
         # Linearized system derivatives
-        dtau_dbeta      = Ng/2*rho*Ar*R*(1/TSR_op)*dCp_dbeta*v**2
-        dtau_dlambda    = Ng/2*rho*Ar*R*v**2*(1/(TSR_op**2))*(dCp_dTSR*TSR_op - Cp_op)
-        dlambda_domega  = R/v/Ng
-        dtau_domega     = dtau_dlambda*dlambda_domega
-
-        dlambda_dv      = -(TSR_op/v)
-
-        Pi_beta         = 1/2 * rho * Ar * v**2 * dCt_dbeta
-        Pi_omega        = 1/2 * rho * Ar * R * v * dCt_dTSR
-        Pi_wind         = 1/2 * rho * Ar * v**2 * dCt_dTSR * dlambda_dv + rho * Ar * v * Ct_op
+        dtau_dbeta, dtau_domega, dtau_dv, Pi_beta, Pi_omega, Pi_wind = linearized_derivatives(
+            rho, R, Ng, rated_rotor_speed, v, TSR_op, Cp_op, Ct_op, dCp_dbeta, dCp_dTSR, dCt_dbeta, dCt_dTSR)
 
         # Second order system coefficients
         if self.VS_ControlMode in [0,2]: # Constant torque above rated
@@ -269,7 +294,6 @@ class Controller():
         B_beta = dtau_dbeta/J         # Blade pitch input 
 
         # Wind Disturbance Input
-        dtau_dv = (0.5 * rho * Ar * 1/rated_rotor_speed) * (dCp_dTSR*dlambda_dv*v**3 + Cp_op*3*v**2) 
         B_wind = dtau_dv/J # wind speed input - currently unused 
 
 
@@ -321,11 +345,9 @@ class Controller():
             self.IPC_Vramp = [turbine.v_rated*0.8, turbine.v_rated]
 
         # Store some variables
-        self.v              = v                                  # Wind speed (m/s)
+        self.op_points      = op_points                          # v (m/s), TSR_op, Cp_op, and pitch_op (rad) at each operating point
         self.v_below_rated  = v_below_rated
-        self.pitch_op       = pitch_op
         self.pitch_op_pc    = pitch_op[-len(v_above_rated)+1:]
-        self.TSR_op         = TSR_op
         self.A              = A 
         self.B_beta         = B_beta
         self.B_tau          = B_tau
@@ -335,9 +357,6 @@ class Controller():
         self.Pi_beta        = Pi_beta
         self.Pi_wind        = Pi_wind
 
-        # - Might want these to debug -
-        self.Cp_op = Cp_op
-
         # --- Minimum pitch saturation ---
         self.ps_min_bld_pitch = np.ones(len(self.pitch_op)) * self.min_pitch
         self.ps = ControllerBlocks()
@@ -503,42 +522,41 @@ class ControllerBlocks():
         A = np.pi*R**2                         # Rotor area (m^2)
         Ng = turbine.Ng                         # Gearbox ratio (-)
         rated_rotor_speed = turbine.rated_rotor_speed               # Rated rotor speed (rad/s)
+        pitch_initial_rad = turbine.pitch_initial_rad
+        min_pitch = controller.min_pitch
+        v = controller.v
+        TSR_op = controller.TSR_op
+        rho_A_2 = 0.5 * rho * A                 # Thrust per unit Ct and v^2 (kg/m)
 
-        # Initialize some arrays
-        Ct_op = np.empty(len(controller.TSR_op),dtype='float64')
-        Ct_max = np.empty(len(controller.TSR_op),dtype='float64')
-        beta_min = np.empty(len(controller.TSR_op),dtype='float64')
         # Find unshaved rotor thurst coefficients and associated rotor thrusts
-        # for i in len(controller.TSR_op):
-        for i in range(len(controller.TSR_op)):
-            Ct_op[i] = turbine.Ct.interp_surface(controller.pitch_op[i],controller.TSR_op[i])
-            T = 0.5 * rho * A * controller.v**2 * Ct_op
+        Ct_op = turbine.Ct.interp_points(controller.pitch_op, TSR_op)
+        T = rho_A_2 * v**2 * Ct_op
 
-        # Define minimum max thrust and initialize pitch_min
+        # Define minimum max thrust
         Tmax = controller.ps_percent * np.max(T)
-        pitch_min = np.ones(len(controller.pitch_op)) * controller.min_pitch
-
-        # Modify pitch_min if max thrust exceeds limits
-        for i in range(len(controller.TSR_op)):
-            # Find Ct values for operational TSR
-            # Ct_tsr = turbine.Ct.interp_surface(turbine.pitch_initial_rad, controller.TSR_op[i])
-            Ct_tsr = turbine.Ct.interp_surface(turbine.pitch_initial_rad,controller.TSR_op[i])
-            # Define max Ct values
-            Ct_max[i] = Tmax/(0.5 * rho * A * controller.v[i]**2)
-            if T[i] > Tmax:
-                Ct_op[i] = Ct_max[i]
-            else:
-                Ct_max[i] = np.minimum( np.max(Ct_tsr), Ct_max[i])
-            # Define minimum pitch angle
-            f_pitch_min = interpolate.interp1d(Ct_tsr, turbine.pitch_initial_rad, kind='linear', bounds_error=False, fill_value=(turbine.pitch_initial_rad[0],turbine.pitch_initial_rad[-1]))
-            pitch_min[i] = max(controller.min_pitch, f_pitch_min(Ct_max[i]))
+
+        # Find Ct values along pitch for every operational TSR, rows ordered as TSR_op
+        Ct_tsr = np.empty((len(TSR_op), len(pitch_initial_rad)))
+        Ct_tsr[np.argsort(TSR_op)] = turbine.Ct.interp_surface(pitch_initial_rad, TSR_op)
+
+        # Define max Ct values, shave Ct_op where max thrust exceeds limits
+        Ct_max = Tmax/(rho_A_2 * v**2)
+        shaved = T > Tmax
+        Ct_op[shaved] = Ct_max[shaved]
+        Ct_max[~shaved] = np.minimum(Ct_tsr.max(axis=1), Ct_max)[~shaved]
+
+        # Define minimum pitch angle, pitch table limits are used off of the Ct surface
+        pitch_min = interp_rows(Ct_max, Ct_tsr, pitch_initial_rad)
+        pitch_min[Ct_max < Ct_tsr.min(axis=1)] = pitch_initial_rad[0]
+        pitch_min[Ct_max > Ct_tsr.max(axis=1)] = pitch_initial_rad[-1]
+        pitch_min = np.maximum(min_pitch, pitch_min)
 
         controller.ps_min_bld_pitch = pitch_min
 
         # save some outputs for analysis or future work
-        self.Tshaved = 0.5 * rho * A * controller.v**2 * Ct_op
+        self.Tshaved = rho_A_2 * v**2 * Ct_op
         self.pitch_min = pitch_min
-        self.v = controller.v
+        self.v = v
         self.Ct_max = Ct_max
         self.Ct_op = Ct_op
         self.T = T
@@ -806,6 +824,106 @@ class OpenLoopControl(object):
 
 # helper functions
 
+def linearized_derivatives(rho, R, Ng, rated_rotor_speed, v, TSR_op, Cp_op, Ct_op, dCp_dbeta, dCp_dTSR, dCt_dbeta, dCt_dTSR):
+    '''
+    Linearized rotor torque and thrust derivatives about a set of operating points. 
+        Pure array math, elementwise over the operating points.
+
+    Parameters:
+    -----------
+    rho : float (kg/m^3)
+          Air density
+    R : float (m)
+        Rotor radius
+    Ng : float (-)
+         Gearbox ratio
+    rated_rotor_speed : float (rad/s)
+                        Rated rotor speed
+    v : array_like (m/s)
+        Operational wind speeds
+    TSR_op : array_like (-)
+             Operational tip-speed ratios
+    Cp_op, Ct_op : array_like (-)
+                   Operational power and thrust coefficients
+    dCp_dbeta, dCp_dTSR, dCt_dbeta, dCt_dTSR : array_like (1/rad, -)
+                                               Cp and Ct surface gradients at the operating points
+
+    Returns:
+    --------
+    dtau_dbeta, dtau_domega, dtau_dv : array_like
+                                       Aerodynamic torque sensitivities to blade pitch, rotor speed, and wind speed
+    Pi_beta, Pi_omega, Pi_wind : array_like
+                                 Rotor thrust sensitivities to blade pitch, rotor speed, and wind speed
+    '''
+    Ar = np.pi*R**2                         # Rotor area (m^2)
+
+    dtau_dbeta      = Ng/2*rho*Ar*R*(1/TSR_op)*dCp_dbeta*v**2
+    dtau_dlambda    = Ng/2*rho*Ar*R*v**2*(1/(TSR_op**2))*(dCp_dTSR*TSR_op - Cp_op)
+    dlambda_domega  = R/v/Ng
+    dtau_domega     = dtau_dlambda*dlambda_domega
+
+    dlambda_dv      = -(TSR_op/v)
+    dtau_dv         = (0.5 * rho * Ar * 1/rated_rotor_speed) * (dCp_dTSR*dlambda_dv*v**3 + Cp_op*3*v**2) 
+
+    Pi_beta         = 1/2 * rho * Ar * v**2 * dCt_dbeta
+    Pi_omega        = 1/2 * rho * Ar * R * v * dCt_dTSR
+    Pi_wind         = 1/2 * rho * Ar * v**2 * dCt_dTSR * dlambda_dv + rho * Ar * v * Ct_op
+
+    return dtau_dbeta, dtau_domega, dtau_dv, Pi_beta, Pi_omega, Pi_wind
+
+
+def interp_rows(x, xp, fp, where=None):
+    '''
+    Row-wise linear interpolation, equivalent to evaluating interpolate.interp1d(xp[i], fp)(x[i]) for
+    every row i of xp, without constructing an interpolant per row
+
+    Parameters:
+    -----------
+    x : array_like (-)
+        [n x 1] array of points to interpolate at, one per row of xp
+    xp : array_like (-)
+        [n x m] array of x-coordinates of the data points, need not be sorted
+    fp : array_like (-)
+        [m x 1] array of y-coordinates of the data points shared by all rows, or [n x m] array with one row per row of xp
+    where : array_like (bool), optional
+            [n x m] mask selecting the data points to use in each row. Rows with a single valid
+            point return its value, rows with none return nan
+
+    Returns:
+    --------
+    yy : array_like (-)
+         [n x 1] array of interpolated values
+    '''
+    x = np.asarray(x, dtype=float)
+    xp = np.asarray(xp, dtype=float)
+    fp = np.broadcast_to(fp, xp.shape)
+    if where is None:
+        where = np.ones(xp.shape, dtype=bool)
+
+    # Sort each row, pushing masked points to the end
+    order = np.argsort(np.where(where, xp, np.inf), axis=1, kind='mergesort')
+    xp_sorted = np.take_along_axis(xp, order, axis=1)
+    fp_sorted = np.take_along_axis(fp, order, axis=1)
+
+    # Row-wise searchsorted, limited to the valid points of each row
+    n_valid = np.sum(where, axis=1)
+    hi = np.sum((xp_sorted < x[:, np.newaxis]) & (np.arange(xp.shape[1]) < n_valid[:, np.newaxis]), axis=1)
+    # Rows with fewer than two valid points hold their single value, or nan if there are none
+    yy = np.full(x.shape, np.nan)
+    single = n_valid == 1
+    yy[single] = fp_sorted[single, 0]
+    rows = n_valid >= 2
+
+    hi = np.clip(hi[rows], 1, n_valid[rows] - 1)[:, np.newaxis]
+    lo = hi - 1
+
+    x_lo, x_hi = np.take_along_axis(xp_sorted[rows], lo, axis=1)[:, 0], np.take_along_axis(xp_sorted[rows], hi, axis=1)[:, 0]
+    f_lo, f_hi = np.take_along_axis(fp_sorted[rows], lo, axis=1)[:, 0], np.take_along_axis(fp_sorted[rows], hi, axis=1)[:, 0]
+
+    yy[rows] = f_lo + (x[rows] - x_lo) * (f_hi - f_lo) / (x_hi - x_lo)
+    return yy
+
+
 def sigma(tt,t0,t1,y0=0,y1=1):
     ''' 
     generates timeseries for a smooth transition from y0 to y1 from x0 to x1
@@ -15,8 +15,6 @@ import datetime
 from scipy import interpolate
 from numpy import gradient
 import pickle
-import matplotlib.pyplot as plt
-import pandas as pd
 
 from ROSCO_toolbox.utilities import load_from_txt
 
@@ -323,6 +321,7 @@ class Turbine():
             from ROSCO_toolbox.ofTools.util import FileTools
         # Load pCrunch tools
         from pCrunch import pdTools, Processing
+        import pandas as pd
 
 
         # setup values for surface
@@ -559,6 +558,7 @@ class RotorPerformance():
     Methods:
     --------
     interp_surface
+    interp_points
     interp_gradient
     plot_performance
 
@@ -568,8 +568,10 @@ class RotorPerformance():
                         An [n x m] array containing a table of rotor performance data (Cp, Ct, Cq).
     pitch_initial_rad : array_like (rad)
                         An [m x 1] or [1 x m] array containing blade pitch angles corresponding to performance_table. 
+                        Must be strictly increasing.
     TSR_initial : array_like (rad)
                     An [n x 1] or [1 x n] array containing tip-speed ratios corresponding to  performance_table 
+                    Must be strictly increasing.
     '''
     def __init__(self,performance_table, pitch_initial_rad, TSR_initial):
 
@@ -578,8 +580,8 @@ class RotorPerformance():
         self.pitch_initial_rad = pitch_initial_rad          # Pitch angles corresponding to x-axis of performance_table (rad)
         self.TSR_initial = TSR_initial                      # Tip-Speed-Ratios corresponding to y-axis of performance_table (rad)
 
-        # Calculate Gradients
-        self.gradient_TSR, self.gradient_pitch = gradient(performance_table)             # gradient_TSR along y-axis, gradient_pitch along x-axis (rows, columns)
+        # Calculate Gradients and form the surface interpolants
+        self._build_interpolants()
 
         # "Optimal" below rated TSR and blade pitch (for Cp) - note this may be limited by resolution of Cp-surface
         self.max = np.amax(performance_table)
@@ -605,22 +607,85 @@ class RotorPerformance():
         performance_max_ind = np.where(performance_fine == np.max(performance_fine))
         self.TSR_opt = float(TSR_fine[performance_max_ind[0]])
 
+    def _build_interpolants(self):
+        '''
+        Calculate gradients of the performance table and form the interpolant functions which look up
+        any arbitrary location on the rotor performance surface. These only depend on the performance
+        table, so they are cached and rebuilt only if performance_table is replaced by another array.
+        Editing performance_table in place is not detected; call _build_interpolants() afterwards.
+        '''
+        self.gradient_TSR, self.gradient_pitch = gradient(self.performance_table)        # gradient_TSR along y-axis, gradient_pitch along x-axis (rows, columns)
+
+        # Splines need strictly increasing 1D axes, the grid is also sorted, as interp2d did
+        TSR_initial = np.ravel(self.TSR_initial)
+        pitch_initial_rad = np.ravel(self.pitch_initial_rad)
+        TSR_sort, pitch_sort = np.argsort(TSR_initial), np.argsort(pitch_initial_rad)
+        grid = np.ix_(TSR_sort, pitch_sort)
+        TSR_initial, pitch_initial_rad = TSR_initial[TSR_sort], pitch_initial_rad[pitch_sort]
+
+        # Interpolating bicubic spline on the (TSR, pitch) grid, same surface as interp2d(kind='cubic')
+        interp_surface = interpolate.RectBivariateSpline(TSR_initial, pitch_initial_rad, self.performance_table[grid], kx=3, ky=3)
+        # Bilinear interpolation of the gradients, same as interp2d(kind='linear')
+        dCP_beta_interp = interpolate.RectBivariateSpline(TSR_initial, pitch_initial_rad, self.gradient_pitch[grid], kx=1, ky=1)
+        dCP_TSR_interp = interpolate.RectBivariateSpline(TSR_initial, pitch_initial_rad, self.gradient_TSR[grid], kx=1, ky=1)
+
+        self._interp_cache = (self.performance_table, interp_surface, dCP_beta_interp, dCP_TSR_interp)
+
+    def _interpolants(self):
+        '''
+        Return the cached (surface, pitch gradient, TSR gradient) interpolants, rebuilding them if needed
+        '''
+        # Instances loaded from older pickles may not have a cache yet
+        if getattr(self, '_interp_cache', None) is None or self._interp_cache[0] is not self.performance_table:
+            self._build_interpolants()
+        return self._interp_cache[1:]
+
     def interp_surface(self,pitch,TSR):
         '''
         2d interpolation to find point on rotor performance surface
         
         Parameters:
         -----------
-        pitch : float (rad)
-                Pitch angle to look up
-        TSR : float (rad)
-              Tip-speed ratio to look up
+        pitch : float or array_like (rad)
+                Pitch angle(s) to look up
+        TSR : float or array_like (rad)
+              Tip-speed ratio(s) to look up
+
+        Returns:
+        --------
+        interp_surface : array_like
+                         [len(TSR) x len(pitch)] array of surface values on the sorted (TSR, pitch) grid, 
+                         flattened to [len(pitch)] if a single TSR is given
         '''
+        interp_fun, _, _ = self._interpolants()
+
+        # Evaluate on the sorted grid of inputs, values outside of the table are taken at the nearest edge
+        z = np.atleast_2d(interp_fun(np.sort(np.ravel(TSR)), np.sort(np.ravel(pitch))))
+        if len(z) == 1:
+            z = z[0]
+        return z
+
+    def interp_points(self,pitch,TSR):
+        '''
+        2d interpolation to find points on rotor performance surface at paired pitch and TSR values
         
-        # Form the interpolant functions which can look up any arbitrary location on rotor performance surface
-        interp_fun = interpolate.interp2d(
-            self.pitch_initial_rad, self.TSR_initial, self.performance_table, kind='cubic')
-        return interp_fun(pitch,TSR)
+        Parameters:
+        -----------
+        pitch : float or array_like (rad)
+                Pitch angle(s) to look up
+        TSR : float or array_like (rad)
+              Tip-speed ratio(s) to look up, paired elementwise with pitch
+
+        Returns:
+        --------
+        interp_points : array_like
+                        Surface values with the broadcast shape of pitch and TSR
+        '''
+        interp_fun, _, _ = self._interpolants()
+
+        # Pointwise evaluation, no sorting or gridding of the inputs
+        TSR_pts, pitch_pts = np.broadcast_arrays(TSR, pitch)
+        return interp_fun.ev(TSR_pts, pitch_pts)
 
     def interp_gradient(self,pitch,TSR):
         '''
@@ -628,23 +693,27 @@ class RotorPerformance():
         
         Parameters:
         -----------
-        pitch : float (rad)
-                Pitch angle to look up
-        TSR : float (rad)
-              Tip-speed ratio to look up
+        pitch : float or array_like (rad)
+                Pitch angle(s) to look up
+        TSR : float or array_like (rad)
+              Tip-speed ratio(s) to look up, paired elementwise with pitch
 
         Returns:
         --------
         interp_gradient : array_like
-                          [1 x 2] array coresponding to gradient in pitch and TSR directions, respectively
+                          [1 x 2] array coresponding to gradient in pitch and TSR directions, respectively, 
+                          or [2 x n] array if pitch and TSR are array_like
         '''
-        # Form the interpolant functions to find gradient at any arbitrary location on rotor performance surface
-        dCP_beta_interp = interpolate.interp2d(self.pitch_initial_rad, self.TSR_initial, self.gradient_pitch, kind='linear')
-        dCP_TSR_interp = interpolate.interp2d(self.pitch_initial_rad, self.TSR_initial, self.gradient_TSR, kind='linear')
+        _, dCP_beta_interp, dCP_TSR_interp = self._interpolants()
+
+        # Pointwise evaluation, values outside of the table are taken at the nearest edge
+        TSR_pts, pitch_pts = np.broadcast_arrays(TSR, pitch)
 
         # grad.shape output as (2,) numpy array, equivalent to (pitch-direction,TSR-direction)
-        grad = np.array([dCP_beta_interp(pitch,TSR), dCP_TSR_interp(pitch,TSR)])
-        return np.ndarray.flatten(grad)
+        grad = np.array([dCP_beta_interp.ev(TSR_pts, pitch_pts), dCP_TSR_interp.ev(TSR_pts, pitch_pts)])
+        if np.ndim(pitch) == 0 and np.ndim(TSR) == 0:
+            return np.ndarray.flatten(grad)
+        return grad
     
     def plot_performance(self):
         '''
@@ -654,6 +723,7 @@ class RotorPerformance():
         -----------
         self
         '''
+        import matplotlib.pyplot as plt
 
         # Find maximum point
         max_ind = np.unravel_index(np.argmax(self.performance_table, axis=None), self.performance_table.shape)
@@ -0,0 +1,77 @@
+"""
+
+Test the row-wise linear interpolation used in ROSCO_toolbox controller tuning
+
+"""
+
+import unittest
+
+import numpy as np
+from scipy import interpolate
+
+from ROSCO_toolbox.controller import interp_rows
+
+
+class TestInterpRows(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_unsorted_rows(self):
+        xp = self.rng.uniform(0., 10., (6, 8))
+        fp = self.rng.uniform(-1., 1., (6, 8))
+        x = self.rng.uniform(xp.min(axis=1), xp.max(axis=1))
+
+        yy = interp_rows(x, xp, fp)
+        yy_ref = [interpolate.interp1d(xp[i], fp[i])(x[i]) for i in range(len(x))]
+        np.testing.assert_allclose(yy, yy_ref, rtol=1e-12, atol=1e-14)
+
+    def test_shared_fp(self):
+        fp = np.linspace(-0.1, 0.4, 5)
+        xp = np.array([[0.5, 0.1, 0.3, 0.2, 0.4],
+                       [0.9, 0.2, 0.4, 0.7, 0.3]])
+        x = np.array([0.25, 0.5])
+
+        yy = interp_rows(x, xp, fp)
+        yy_ref = [interpolate.interp1d(xp[i], fp)(x[i]) for i in range(len(x))]
+        np.testing.assert_allclose(yy, yy_ref, rtol=1e-12, atol=1e-14)
+
+    def test_masked_branch(self):
+        # Non-monotonic rows, only the increasing branch is selected
+        fp = np.linspace(0., 1., 7)
+        xp = np.array([[0.1, 0.3, 0.5, 0.6, 0.4, 0.2, 0.0],
+                       [0.0, 0.2, 0.3, 0.5, 0.8, 0.7, 0.1]])
+        where = np.array([[True, True, True, True, False, False, False],
+                          [True, True, True, True, True, False, False]])
+        x = np.array([0.45, 0.65])
+
+        yy = interp_rows(x, xp, fp, where=where)
+        yy_ref = [np.interp(x[i], xp[i][where[i]], fp[where[i]]) for i in range(len(x))]
+        np.testing.assert_allclose(yy, yy_ref, rtol=1e-12, atol=1e-14)
+
+    def test_duplicate_abscissae(self):
+        fp = np.array([0., 1., 2., 3., 4.])
+        xp = np.array([[0.0, 1.0, 1.0, 2.0, 3.0],
+                       [3.0, 2.0, 2.0, 1.0, 0.0]])
+        x = np.array([1.5, 0.5])
+
+        yy = interp_rows(x, xp, fp)
+        yy_ref = [interpolate.interp1d(xp[i], fp)(x[i]) for i in range(len(x))]
+        np.testing.assert_allclose(yy, yy_ref, rtol=1e-12, atol=1e-14)
+
+    def test_single_valid_point(self):
+        fp = np.array([0., 1., 2., 3.])
+        xp = np.array([[0.0, 1.0, 2.0, 3.0],
+                       [0.0, 1.0, 2.0, 3.0],
+                       [0.0, 1.0, 2.0, 3.0]])
+        where = np.array([[True, True, True, True],
+                          [False, False, True, False],
+                          [False, False, False, False]])
+        x = np.array([1.5, 0.5, 0.5])
+
+        yy = interp_rows(x, xp, fp, where=where)
+        self.assertAlmostEqual(yy[0], np.interp(x[0], xp[0], fp))
+        self.assertEqual(yy[1], 2.)
+        self.assertTrue(np.isnan(yy[2]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+
+Test the rotor performance surface lookups used in ROSCO_toolbox controller tuning
+
+"""
+
+import os
+import unittest
+
+import numpy as np
+
+from ROSCO_toolbox.turbine import RotorPerformance
+from ROSCO_toolbox.utilities import load_from_txt
+
+this_file_dir = os.path.dirname(os.path.realpath(__file__))
+weis_dir = os.path.dirname(os.path.dirname(this_file_dir))
+rotor_performance_file = os.path.join(os.path.dirname(weis_dir), 'ROSCO', 'Test_Cases', 'NREL-5MW', 'Cp_Ct_Cq.NREL5MW.txt')
+
+class TestRotorPerformance(unittest.TestCase):
+    def setUp(self):
+        pitch_initial_rad, TSR_initial, Cp, _, _ = load_from_txt(rotor_performance_file)
+        self.Cp = RotorPerformance(Cp, pitch_initial_rad, TSR_initial)
+        self.pitch = np.array([0.02, 0.05, 0.1, 0.2])
+        self.TSR = np.array([4.5, 6.2, 7.5, 9.1])
+
+    def test_interp_points(self):
+        # Paired points are the diagonal of the gridded lookup
+        Cp_points = self.Cp.interp_points(self.pitch, self.TSR)
+        Cp_grid = self.Cp.interp_surface(self.pitch, self.TSR)
+        np.testing.assert_allclose(Cp_points, np.diag(Cp_grid), rtol=1e-12)
+
+        # A scalar TSR is broadcast against all pitch angles
+        Cp_points = self.Cp.interp_points(self.pitch, self.TSR[1])
+        Cp_grid = self.Cp.interp_surface(self.pitch, self.TSR[1])
+        self.assertEqual(Cp_points.shape, self.pitch.shape)
+        np.testing.assert_allclose(Cp_points, Cp_grid, rtol=1e-12)
+
+    def test_interp_gradient(self):
+        grad = self.Cp.interp_gradient(self.pitch[0], self.TSR[0])
+        self.assertEqual(grad.shape, (2,))
+
+        grad_array = self.Cp.interp_gradient(self.pitch, self.TSR)
+        self.assertEqual(grad_array.shape, (2, len(self.pitch)))
+        np.testing.assert_allclose(grad_array[:, 0], grad, rtol=1e-12)
+
+    def test_replace_table(self):
+        Cp_initial = self.Cp.interp_points(self.pitch, self.TSR)
+
+        # Replacing the table rebuilds the cached interpolants
+        self.Cp.performance_table = 2 * self.Cp.performance_table
+        np.testing.assert_allclose(self.Cp.interp_points(self.pitch, self.TSR), 2 * Cp_initial, rtol=1e-12)
+        self.assertIs(self.Cp._interp_cache[0], self.Cp.performance_table)
+
+if __name__ == "__main__":
+    unittest.main()